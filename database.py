@@ -97,6 +97,7 @@ class Database:
                 runtime        REAL,
                 var_count      INTEGER,
                 const_count    INTEGER,
+                cut_count      INTEGER,
                 FOREIGN KEY (scenario_id) REFERENCES scenarios (id)
             )
             """
@@ -156,6 +157,7 @@ class Database:
             "cpm_lb": "REAL",
             "solver_time": "REAL",
             "runtime": "REAL",
+            "cut_count": "INTEGER",
         }.items():
             self._add_column_if_missing("solution", col, definition)
 
@@ -346,6 +348,7 @@ class Database:
         runtime: float | None = None,
         var_count: int | None = None,
         const_count: int | None = None,
+        cut_count: int | None = None,
     ) -> int:
         self.cur.execute(
             """
@@ -370,8 +373,9 @@ class Database:
                 runtime,
                 var_count,
                 const_count,
+                cut_count
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 instance_id,
@@ -394,6 +398,7 @@ class Database:
                 runtime,
                 var_count,
                 const_count,
+                cut_count,
             ),
         )
         self.conn.commit()
@@ -421,6 +426,7 @@ class Database:
         runtime: float | None = None,
         var_count: int | None = None,
         const_count: int | None = None,
+        cut_count: int | None = None,
     ) -> None:
         self.cur.execute(
             """
@@ -442,7 +448,8 @@ class Database:
                 solver_time   = ?,
                 runtime       = ?,
                 var_count     = ?,
-                const_count   = ?
+                const_count   = ?,
+                cut_count     = ?
             WHERE instance_id = ? AND solver = ? AND scarcity = ?
             """,
             (
@@ -463,6 +470,7 @@ class Database:
                 runtime,
                 var_count,
                 const_count,
+                cut_count,
                 instance_id,
                 solver,
                 scarcity,
@@ -514,6 +522,7 @@ class Database:
         runtime: float | None,
         var_count: int | None,
         const_count: int | None,
+        cut_count: int | None = None,
     ) -> int:
         row = self.get_solution(instance_id, solver, scarcity)
         kwargs = dict(
@@ -537,6 +546,7 @@ class Database:
             runtime=runtime,
             var_count=var_count,
             const_count=const_count,
+            cut_count=cut_count,
         )
         if row is None:
             return self.add_solution(**kwargs)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from itertools import takewhile
+from functools import cached_property
 from typing import Optional
 
 import numpy as np
@@ -86,29 +86,94 @@ class Process:
     def active_phases(self) -> int:
         return len(self.network_type.value)
 
-    def max_processing_time(self) -> int:
-        total = 0
+    @cached_property
+    def phase_offsets(self) -> list[list[list[int]]]:
+        """
+        phase_offsets[phase][mode][j] is the offset of task j from the phase
+        start when the phase runs in that mode; the final entry is the phase
+        duration.
+        """
+        offsets: list[list[list[int]]] = []
         for phase_idx, phase in enumerate(self.phases):
-            total += max(
-                sum(task.duration[m] for task in self.tasks[phase_idx])
+            phase_offsets: list[list[int]] = []
+            for m in range(phase.number_of_modes):
+                running = 0
+                mode_offsets = [running]
+                for task in self.tasks[phase_idx]:
+                    running += task.duration[m]
+                    mode_offsets.append(running)
+                phase_offsets.append(mode_offsets)
+            offsets.append(phase_offsets)
+        return offsets
+
+    @cached_property
+    def phase_plans(self) -> list[list[np.ndarray]]:
+        """
+        phase_plans[phase][mode] is an int32 array with one row
+        (resource, offset, duration) for every task in that phase and mode
+        that occupies a resource. Built once, so repeated simulations of the
+        same mode choice share it.
+        """
+        plans: list[list[np.ndarray]] = []
+        for phase_idx, (phase, phase_offsets) in enumerate(
+            zip(self.phases, self.phase_offsets)
+        ):
+            plans.append([
+                np.array(
+                    [
+                        (task.resource[m], phase_offsets[m][j], task.duration[m])
+                        for j, task in enumerate(self.tasks[phase_idx])
+                        if task.resource[m] is not None and task.duration[m] > 0
+                    ],
+                    dtype=np.int32,
+                ).reshape(-1, 3)
                 for m in range(phase.number_of_modes)
-            )
-        return total
+            ])
+        return plans
+
+    def max_processing_time(self) -> int:
+        return sum(
+            max(mode_offsets[-1] for mode_offsets in phase_offsets)
+            for phase_offsets in self.phase_offsets
+        )
+
+    @cached_property
+    def mode_demands(self) -> list[list[tuple[int, dict[int, int]]]]:
+        """
+        mode_demands[phase] lists (mode, {resource: demand}) for the distinct
+        modes of a phase. Modes whose task chains coincide (same durations and
+        resources) are represented by their first occurrence only.
+        """
+        demands: list[list[tuple[int, dict[int, int]]]] = []
+        for phase_idx, phase in enumerate(self.phases):
+            seen: set[tuple[tuple[int, int | None], ...]] = set()
+            phase_demands: list[tuple[int, dict[int, int]]] = []
+            for mode in range(phase.number_of_modes):
+                chain = tuple(
+                    (task.duration[mode], task.resource[mode])
+                    for task in self.tasks[phase_idx]
+                )
+                if chain in seen:
+                    continue
+                seen.add(chain)
+
+                demand: dict[int, int] = {}
+                for duration, resource in chain:
+                    if resource is not None:
+                        demand[resource] = demand.get(resource, 0) + duration
+                phase_demands.append((mode, demand))
+            demands.append(phase_demands)
+        return demands
 
     def get_max_resource_demand_mode(self, resource: int) -> list[int | None]:
         best_mode: list[int | None] = [None] * len(self.phases)
         best_demand = [float("-inf")] * len(self.phases)
 
-        for phase_idx, phase_tasks in enumerate(self.tasks):
-            n_modes = self.phases[phase_idx].number_of_modes
-            for mode in range(n_modes):
-                demand = sum(
-                    task.duration[mode]
-                    for task in phase_tasks
-                    if task.resource[mode] == resource
-                )
-                if demand > best_demand[phase_idx]:
-                    best_demand[phase_idx] = demand
+        for phase_idx, phase_demands in enumerate(self.mode_demands):
+            for mode, demand in phase_demands:
+                resource_demand = demand.get(resource, 0)
+                if resource_demand > best_demand[phase_idx]:
+                    best_demand[phase_idx] = resource_demand
                     best_mode[phase_idx] = mode
 
         return best_mode
@@ -127,6 +192,17 @@ class Process:
         for phase in self.phases:
             phase_tasks: list[Task] = []
 
+            # Durations of the dummy run directly following each real task,
+            # accumulated in a single forward pass per mode.
+            trailing = [[0.0] * phase.number_of_tasks for _ in range(phase.number_of_modes)]
+            for m in range(phase.number_of_modes):
+                last_real: Optional[int] = None
+                for k in range(phase.number_of_tasks):
+                    if not phase.get_task(m, k).is_dummy:
+                        last_real = k
+                    elif last_real is not None:
+                        trailing[m][last_real] += phase.get_duration(k, m)
+
             for j in range(phase.number_of_tasks):
                 durations: list[int] = []
                 resources: list[int | None] = []
@@ -139,14 +215,7 @@ class Process:
                         resources.append(None)
                         continue
 
-                    duration = phase.get_duration(j, m)
-                    duration += sum(
-                        phase.get_duration(k, m)
-                        for k in takewhile(
-                            lambda x: phase.get_task(m, x).is_dummy,
-                            range(j + 1, phase.number_of_tasks),
-                        )
-                    )
+                    duration = phase.get_duration(j, m) + trailing[m][j]
 
                     if variance > 0.0:
                         duration = max(1.0, duration * rng.normal(1.0, variance))
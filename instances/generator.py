@@ -48,17 +48,17 @@ def generate_instance(
     for ra in ra_pst_by_file.values():
         ra._global_resource_ids = global_resource_ids
 
-    resource_ratios = {
-        rid: max(
-            min_resource_ratio,
-            float(rng.normal(resource_ratio_center, resource_ratio_spread)),
-        )
-        for rid in global_resource_ids
-    }
+    ratio_draws = rng.normal(
+        resource_ratio_center, resource_ratio_spread, size=len(global_resource_ids)
+    )
+    resource_ratios = dict(
+        zip(global_resource_ids, np.maximum(ratio_draws, min_resource_ratio).tolist())
+    )
 
     interarrival_times = rng.exponential(1.0 / arrival_rate, size=number_of_processes)
     batch_sizes = rng.poisson(batch_size, size=number_of_processes)
 
+    network_types = list(NetworkType)
     processes: list[Process] = []
     current_start = 0
 
@@ -75,16 +75,17 @@ def generate_instance(
                 ra_pst = ra_pst_by_file[rng.choice(phase_pools[phase_idx])]
                 phases.append(
                     PhaseProfile(
-                        base_durations=[
-                            rng.uniform(min_base_duration, max_base_duration)
-                            for _ in range(ra_pst.get_number_of_tasks())
-                        ],
+                        base_durations=rng.uniform(
+                            min_base_duration,
+                            max_base_duration,
+                            size=ra_pst.get_number_of_tasks(),
+                        ).tolist(),
                         resource_ratios=resource_ratios,
                         ra_pst=ra_pst,
                     )
                 )
 
-            network = rng.choice(list(NetworkType))
+            network = network_types[rng.integers(len(network_types))]
             process = Process(
                 network_type=network,
                 phases=phases,
@@ -108,8 +109,22 @@ def active_phases(network_type: NetworkType) -> int:
     return len(network_type.value)
 
 
-def make_phase_timelines(max_phases: int) -> list[DefaultDict[int, DefaultDict[int, int]]]:
-    return [defaultdict(lambda: defaultdict(int)) for _ in range(max_phases)]
+def make_phase_timelines(max_phases: int) -> list[DefaultDict[tuple[int, int], int]]:
+    """
+    Per-phase demand counters keyed by flat (time, resource) pairs.
+    """
+    return [defaultdict(int) for _ in range(max_phases)]
+
+
+def nest_timeline(flat: dict[tuple[int, int], int]) -> PhaseTimeline:
+    """
+    Convert a flat {(t, resource): count} counter into a time-sorted
+    {t: {resource: count}} timeline.
+    """
+    timeline: PhaseTimeline = {}
+    for (t, res), count in sorted(flat.items()):
+        timeline.setdefault(t, {})[res] = count
+    return timeline
 
 
 def collect_resource_indices(processes: list[Process]) -> list[int]:
@@ -125,41 +140,103 @@ def collect_resource_indices(processes: list[Process]) -> list[int]:
     )
 
 
+def timeline_shape(processes: list[Process], max_phases: int) -> tuple[int, int, int]:
+    """
+    Shape (phases, resources, horizon) of a dense demand tensor large enough
+    to hold any earliest-start simulation of the given processes.
+    """
+    resources = collect_resource_indices(processes)
+    n_resources = resources[-1] + 1 if resources else 0
+    horizon = max(
+        (process.start_time + process.max_processing_time() for process in processes),
+        default=0,
+    )
+    return max_phases, n_resources, horizon
+
+
+def make_phase_counts(processes: list[Process], max_phases: int) -> np.ndarray:
+    return np.zeros(timeline_shape(processes, max_phases), dtype=np.int32)
+
+
+def counts_to_timelines(counts: np.ndarray) -> list[PhaseTimeline]:
+    """
+    Convert a dense counts[phase, resource, time] tensor into sparse
+    per-phase timelines {t: {resource: count}} containing only nonzero entries.
+    """
+    timelines: list[PhaseTimeline] = []
+    for phase_counts in counts:
+        timeline: PhaseTimeline = {}
+        times, resources = np.nonzero(phase_counts.T)
+        for t, res in zip(times.tolist(), resources.tolist()):
+            timeline.setdefault(t, {})[res] = int(phase_counts[res, t])
+        timelines.append(timeline)
+    return timelines
+
+
 def schedule_phase(
     process: Process,
     phase_idx: int,
     mode: int,
     phase_end: list[int],
-    phase_timelines: list[DefaultDict[int, DefaultDict[int, int]]],
+    rows: list[np.ndarray],
 ) -> int:
+    """
+    Append the (phase, resource, start, duration) rows of one phase run in
+    the given mode to rows and return the phase end time.
+    """
     predecessors = process.network_type.value[phase_idx]
     start = process.start_time if not predecessors else max(phase_end[p] for p in predecessors)
 
-    t = start
-    for task in process.tasks[phase_idx]:
-        duration = task.duration[mode]
-        resource = task.resource[mode]
-        if resource is not None:
-            for tau in range(duration):
-                phase_timelines[phase_idx][t + tau][resource] += 1
-        t += duration
+    plan = process.phase_plans[phase_idx][mode]
+    if len(plan):
+        block = np.empty((len(plan), 4), dtype=np.int32)
+        block[:, 0] = phase_idx
+        block[:, 1] = plan[:, 0]
+        block[:, 2] = plan[:, 1] + start
+        block[:, 3] = plan[:, 2]
+        rows.append(block)
 
-    return t
+    return start + process.phase_offsets[phase_idx][mode][-1]
 
 
-def simulate_extremal(
+def accumulate_plan(rows: list[np.ndarray], counts: np.ndarray) -> np.ndarray:
+    """
+    Add every (phase, resource, start, duration) row to counts in place.
+
+    Each row contributes +1 at its start and -1 at its end in a difference
+    tensor; a cumulative sum over time then yields the occupancy, so the
+    whole plan is accumulated without a Python-level loop over tasks.
+    """
+    if not rows:
+        return counts
+
+    phase, res, start, duration = np.concatenate(rows).T
+    diff = np.zeros((*counts.shape[:-1], counts.shape[-1] + 1), dtype=counts.dtype)
+    np.add.at(diff, (phase, res, start), 1)
+    np.add.at(diff, (phase, res, start + duration), -1)
+    counts += np.cumsum(diff, axis=-1, dtype=counts.dtype)[..., :-1]
+    return counts
+
+
+def simulate_extremal_array(
     processes: list[Process],
     max_phases: int,
-) -> list[list[PhaseTimeline]]:
+) -> np.ndarray:
     """
     For each resource, choose in every phase the mode with maximum demand for
     that resource and simulate earliest-start execution.
-    """
-    timelines_by_resource: list[list[PhaseTimeline]] = []
 
-    for resource in collect_resource_indices(processes):
-        phase_timelines = make_phase_timelines(max_phases)
+    Returns counts[resource_row, phase, resource, time], where resource_row
+    follows collect_resource_indices(processes).
+    """
+    resource_indices = collect_resource_indices(processes)
+    counts = np.zeros(
+        (len(resource_indices), *timeline_shape(processes, max_phases)),
+        dtype=np.int32,
+    )
 
+    for row, resource in enumerate(resource_indices):
+        rows: list[np.ndarray] = []
         for process in processes:
             modes = process.get_max_resource_demand_mode(resource)
             phase_end: list[int] = []
@@ -170,30 +247,45 @@ def simulate_extremal(
                     phase_end.append(phase_end[-1] if phase_end else process.start_time)
                     continue
                 phase_end.append(
-                    schedule_phase(process, phase_idx, mode, phase_end, phase_timelines)
+                    schedule_phase(process, phase_idx, mode, phase_end, rows)
                 )
 
-        timelines_by_resource.append(phase_timelines)
+        accumulate_plan(rows, counts[row])
 
-    return timelines_by_resource
+    return counts
 
 
-def simulate_processes(
+def simulate_extremal(
+    processes: list[Process],
+    max_phases: int,
+) -> list[list[PhaseTimeline]]:
+    """
+    Sparse-timeline view of simulate_extremal_array.
+    """
+    return [
+        counts_to_timelines(resource_counts)
+        for resource_counts in simulate_extremal_array(processes, max_phases)
+    ]
+
+
+def simulate_processes_array(
     processes: list[Process],
     max_phases: int,
     seed: Optional[int] = None,
-) -> list[PhaseTimeline]:
+) -> np.ndarray:
     """
-    Simulate processes under randomly selected phase modes.
+    Simulate processes under randomly selected phase modes and return the
+    demand tensor counts[phase, resource, time].
     """
     rng = np.random.default_rng(seed)
-    phase_timelines = make_phase_timelines(max_phases)
+    rows: list[np.ndarray] = []
+
+    # Draw the modes of every phase of every process in one vectorized call.
+    n_modes = [phase.number_of_modes for process in processes for phase in process.phases]
+    draws = iter(rng.integers(np.array(n_modes, dtype=np.int64)).tolist())
 
     for process in processes:
-        modes = [
-            int(rng.integers(process.phases[i].number_of_modes))
-            for i in range(len(process.phases))
-        ]
+        modes = [next(draws) for _ in process.phases]
 
         phase_end: list[int] = []
         for phase_idx in range(active_phases(process.network_type)):
@@ -203,11 +295,22 @@ def simulate_processes(
                     phase_idx,
                     modes[phase_idx],
                     phase_end,
-                    phase_timelines,
+                    rows,
                 )
             )
 
-    return [dict(sorted(tl.items())) for tl in phase_timelines]
+    return accumulate_plan(rows, make_phase_counts(processes, max_phases))
+
+
+def simulate_processes(
+    processes: list[Process],
+    max_phases: int,
+    seed: Optional[int] = None,
+) -> list[PhaseTimeline]:
+    """
+    Simulate processes under randomly selected phase modes.
+    """
+    return counts_to_timelines(simulate_processes_array(processes, max_phases, seed))
 
 
 def compute_min_demands(
@@ -261,21 +364,20 @@ def get_min_max_demands(
       (minimum guaranteed demand, maximum observed extremal demand).
     """
     resource_indices = collect_resource_indices(processes)
-    timelines_max = simulate_extremal(processes, max_phases=max_phases)
+    counts_max = simulate_extremal_array(processes, max_phases=max_phases)
 
     if plot:
         plot_combined_resource_demands(
-            timelines_by_resource=timelines_max,
+            counts_by_resource=counts_max,
             resource_indices=resource_indices,
         )
 
-    max_demands: dict[int, int] = {}
-    for res_idx, resource_phase_timelines in zip(resource_indices, timelines_max):
-        combined = defaultdict(int)
-        for phase_timeline in resource_phase_timelines:
-            for t, counts in phase_timeline.items():
-                combined[t] += counts.get(res_idx, 0)
-        max_demands[res_idx] = max(combined.values(), default=0)
+    # Sum over phases, then take the peak over time of each resource's own row.
+    combined = counts_max.sum(axis=1, dtype=counts_max.dtype)
+    max_demands: dict[int, int] = {
+        res_idx: int(combined[row, res_idx].max(initial=0))
+        for row, res_idx in enumerate(resource_indices)
+    }
 
     min_demands_by_phase = compute_min_demands(processes, max_phases)
     all_min_resources = sorted({r for phase in min_demands_by_phase for r in phase})
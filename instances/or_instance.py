@@ -1,32 +1,49 @@
 from __future__ import annotations
 
+import multiprocessing as mp
 import random
 from collections import defaultdict
+from functools import lru_cache, partial
 from typing import Any, Optional
 
+from src.utils import get_unrelated_pairs
+
 from .definitions import Process
-from .generator import active_phases, get_capacity, make_phase_timelines
+from .generator import active_phases, get_capacity, make_phase_timelines, nest_timeline
 
 PhaseTimeline = dict[int, dict[int, int]]
 
 
+def serial_horizon(processes: list[Process]) -> int:
+    """
+    Trivial horizon bound: every process run back to back in its slowest modes.
+    """
+    return sum(p.max_processing_time() for p in processes) + 1
+
+
 def greedy_schedule(
     processes: list[Process],
     max_phases: int,
     capacities: dict[int, int],
+    rng: Optional[random.Random] = None,
+    horizon_ub: Optional[int] = None,
 ) -> tuple[list[PhaseTimeline], int]:
     """
     Greedy earliest-start schedule subject to renewable resource capacities.
+    Modes are drawn from rng, or from the module-level generator if omitted.
+    horizon_ub caps the start-time search; it defaults to the serial bound.
     """
+    randrange = rng.randrange if rng is not None else random.randrange
     phase_timelines = make_phase_timelines(max_phases)
-    usage: dict[int, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    usage: dict[tuple[int, int], int] = defaultdict(int)
 
-    horizon_ub = sum(p.max_processing_time() for p in processes) + 1
+    if horizon_ub is None:
+        horizon_ub = serial_horizon(processes)
     makespan = 0
 
     for process in processes:
         modes = [
-            random.randrange(process.phases[i].number_of_modes)
+            randrange(process.phases[i].number_of_modes)
             for i in range(len(process.phases))
         ]
 
@@ -42,14 +59,14 @@ def greedy_schedule(
 
                 if resource is not None:
                     cap = capacities.get(resource, float("inf"))
-                    while any(usage[t + dt][resource] >= cap for dt in range(duration)):
+                    while any(usage.get((t + dt, resource), 0) >= cap for dt in range(duration)):
                         t += 1
                         if t > horizon_ub:
                             break
 
                     for dt in range(duration):
-                        usage[t + dt][resource] += 1
-                        phase_timelines[phase_idx][t + dt][resource] += 1
+                        usage[t + dt, resource] += 1
+                        phase_timelines[phase_idx][t + dt, resource] += 1
 
                 t += duration
 
@@ -58,7 +75,20 @@ def greedy_schedule(
         if phase_end:
             makespan = max(makespan, max(phase_end))
 
-    return [dict(sorted(tl.items())) for tl in phase_timelines], makespan
+    return [nest_timeline(tl) for tl in phase_timelines], makespan
+
+
+def _greedy_makespan(
+    processes: list[Process],
+    max_phases: int,
+    capacities: dict[int, int],
+    horizon_ub: int,
+    seed: int,
+) -> int:
+    _, makespan = greedy_schedule(
+        processes, max_phases, capacities, rng=random.Random(seed), horizon_ub=horizon_ub
+    )
+    return makespan
 
 
 def estimate_time_horizon(
@@ -66,18 +96,118 @@ def estimate_time_horizon(
     max_phases: int,
     capacities: dict[int, int],
     trials: int = 20,
+    workers: int = 1,
 ) -> int:
     """
     Estimate a feasible horizon by repeated greedy schedules.
+
+    Trials are independent. With workers > 1 they run on a process pool of that
+    size. The default of 1 runs them in-process: a greedy trial is cheap,
+    and get_or_instance calls this per model and scarcity, where pool
+    startup costs about as much as the trials themselves. Each trial gets its
+    own seed drawn from the module-level generator, so results stay
+    reproducible under random.seed() for any worker count.
     """
-    best = sum(p.max_processing_time() for p in processes) + 1
-    for _ in range(trials):
-        _, makespan = greedy_schedule(processes, max_phases, capacities)
+    best = serial_horizon(processes)
+    seeds = [random.getrandbits(64) for _ in range(trials)]
+    trial = partial(_greedy_makespan, processes, max_phases, capacities, best)
+
+    workers = min(workers, trials)
+    if workers > 1:
+        chunksize = -(-trials // workers)
+        with mp.Pool(workers) as pool:
+            makespans = list(pool.imap_unordered(trial, seeds, chunksize=chunksize))
+    else:
+        makespans = [trial(seed) for seed in seeds]
+
+    for makespan in makespans:
         best = min(best, makespan + 1)
     print(f"Estimated T = {best}")
     return best
 
 
+@lru_cache(maxsize=32)
+def transitive_closure(
+    n: int,
+    edges: tuple[tuple[int, int], ...],
+) -> tuple[frozenset[int], ...]:
+    """
+    Successor sets of the transitive closure of the precedence arcs.
+    """
+    adj: dict[int, set[int]] = {i: set() for i in range(n)}
+    for i, j in edges:
+        adj[i].add(j)
+
+    for k in range(n):
+        for i in range(n):
+            if k in adj[i]:
+                adj[i] |= adj[k]
+
+    return tuple(frozenset(adj[i]) for i in range(n))
+
+
+@lru_cache(maxsize=32)
+def earliest_start_times(
+    n: int,
+    edges: tuple[tuple[int, int], ...],
+    p_min: tuple[int, ...],
+    release: tuple[int, ...],
+) -> tuple[int, ...]:
+    """
+    Earliest start times from the precedence closure and the release times.
+    They do not depend on the horizon, so re-estimating T keeps them cached.
+    """
+    adj = transitive_closure(n, edges)
+
+    ES = list(release)
+    for i in range(n):
+        for k in range(n):
+            if i in adj[k]:
+                ES[i] = max(ES[i], ES[k] + p_min[k])
+
+    return tuple(ES)
+
+
+@lru_cache(maxsize=32)
+def latest_start_times(
+    n: int,
+    T: int,
+    edges: tuple[tuple[int, int], ...],
+    p_min: tuple[int, ...],
+) -> tuple[int, ...]:
+    """
+    Latest start times from the precedence closure within horizon T.
+    """
+    adj = transitive_closure(n, edges)
+
+    LS = [T - 1] * n
+    for i in range(n - 1, -1, -1):
+        for k in adj[i]:
+            LS[i] = min(LS[i], LS[k] - p_min[i])
+
+    return tuple(LS)
+
+
+def get_start_time_bounds(
+    n: int,
+    T: int,
+    E: list[list[int]],
+    p: list[list[int]],
+    release: list[int],
+) -> tuple[list[int], list[int]]:
+    """
+    Earliest and latest start times from the precedence closure, using the
+    shortest mode of each job. get_or_instance is rebuilt for every model and
+    scarcity, so both bounds are memoized; ES on (n, E, min p, release) and
+    LS on (n, T, E, min p).
+    """
+    edges = tuple((i, j) for i, j in E)
+    p_min = tuple(min(job) for job in p)
+    ES = earliest_start_times(n, edges, p_min, tuple(release))
+    LS = latest_start_times(n, T, edges, p_min)
+    return list(ES), list(LS)
+
+
 def get_or_instance(
     processes: list[Process],
     scarcity: float,
@@ -190,33 +320,12 @@ def get_or_instance(
 
     n = sink + 1
 
-    # Transitive closure
-    adj: dict[int, set[int]] = {i: set() for i in range(n)}
-    for i, j in E:
-        adj[i].add(j)
-
-    for k in range(n):
-        for i in range(n):
-            if k in adj[i]:
-                adj[i] |= adj[k]
-
+    adj = transitive_closure(n, tuple((i, j) for i, j in E))
     TE = [[i, j] for i in range(n) for j in adj[i]]
 
-    # Earliest start bounds
-    for i in range(n):
-        for k in range(n):
-            if i in adj[k]:
-                ES[i] = max(ES[i], ES[k] + min(p[k]))
-
-    # Latest start bounds
-    LS = [int(max_start_time) - 1] * n
-    for i in range(n - 1, -1, -1):
-        for k in range(n):
-            if k in adj[i]:
-                LS[i] = min(LS[i], LS[k] - min(p[i]))
+    ES, LS = get_start_time_bounds(n, int(max_start_time), E, p, ES)
 
-    comparable = {(i, j) for i, j in TE} | {(j, i) for i, j in TE}
-    VP = [[i, j] for i in range(n) for j in range(n) if i != j and (i, j) not in comparable]
+    VP = get_unrelated_pairs(n, TE)
 
     return {
         "n": n,
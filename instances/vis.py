@@ -1,30 +1,32 @@
 from __future__ import annotations
 
 import os
-from typing import Dict
 
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
+import numpy as np
 
-PhaseTimeline = Dict[int, Dict[int, int]]
 PHASE_CMAP = "tab10"
 
 
 def plot_combined_resource_demands(
-    timelines_by_resource: list[list[PhaseTimeline]],
+    counts_by_resource: np.ndarray,
     resource_indices: list[int],
     filename: str = "resource_demands.png",
     output_dir: str = "plots",
 ) -> None:
     """
     Plot, for each resource, total demand over time and its decomposition by phase.
+
+    counts_by_resource[row, phase, resource, time] holds the simulated demand
+    for the resource resource_indices[row].
     """
-    if not timelines_by_resource:
+    if len(counts_by_resource) == 0:
         print("No timeline data to plot.")
         return
 
     n_resources = len(resource_indices)
-    n_phases = len(timelines_by_resource[0])
+    n_phases = counts_by_resource.shape[1]
     cmap = plt.get_cmap(PHASE_CMAP)
     phase_colors = [cmap(i / max(n_phases, 1)) for i in range(n_phases)]
 
@@ -35,32 +37,28 @@ def plot_combined_resource_demands(
         squeeze=False,
     )
 
-    for row, (resource_idx, resource_timelines) in enumerate(
-        zip(resource_indices, timelines_by_resource)
-    ):
+    for row, resource_idx in enumerate(resource_indices):
         ax = axes[row, 0]
+        resource_counts = counts_by_resource[row]
 
-        all_times = sorted({t for tl in resource_timelines for t in tl})
-        if not all_times:
+        active_times = np.flatnonzero(resource_counts.any(axis=(0, 1)))
+        if not len(active_times):
             ax.set_visible(False)
             continue
 
-        time_points = list(range(min(all_times), max(all_times) + 2))
-
-        phase_profiles: list[list[int]] = [
-            [phase_tl.get(t, {}).get(resource_idx, 0) for t in time_points[:-1]] + [0]
-            for phase_tl in resource_timelines
-        ]
+        t_min, t_max = int(active_times[0]), int(active_times[-1])
+        time_points = np.arange(t_min, t_max + 2)
 
-        totals = [
-            sum(profile[t] for profile in phase_profiles)
-            for t in range(len(time_points))
-        ]
-
-        bottoms = [0] * len(time_points)
-        for phase_idx, profile in enumerate(phase_profiles):
-            tops = [b + x for b, x in zip(bottoms, profile)]
+        # Stacked phase profiles, padded with a trailing zero for the step plot.
+        phase_profiles = np.zeros(
+            (n_phases, len(time_points)), dtype=resource_counts.dtype
+        )
+        phase_profiles[:, :-1] = resource_counts[:, resource_idx, t_min : t_max + 1]
+        stacked = np.cumsum(phase_profiles, axis=0, dtype=phase_profiles.dtype)
+        totals = stacked[-1]
 
+        bottoms = np.zeros(len(time_points), dtype=phase_profiles.dtype)
+        for phase_idx, tops in enumerate(stacked):
             ax.step(
                 time_points,
                 tops,
@@ -92,7 +90,7 @@ def plot_combined_resource_demands(
         ax.set_title(f"Resource {resource_idx + 1} — Combined Demand")
         ax.set_xlabel("Time")
         ax.set_ylabel("Required units")
-        ax.set_ylim(0, max(totals, default=0) + 1.5)
+        ax.set_ylim(0, int(totals.max()) + 1.5)
         ax.grid(True, linestyle=":", alpha=0.6)
         ax.legend(loc="upper right", framealpha=0.95)
         ax.xaxis.set_major_locator(ticker.MaxNLocator(integer=True))
@@ -296,10 +296,18 @@ class RA_PST:
     def get_number_of_resources(self) -> int:
         return len(self.get_resource_ids())
 
-    def get_resource(self, task: int, mode: int) -> Optional[int]:
+    def get_resource_index(self) -> dict[str, int]:
+        # Rebuilt only when the active id list changes (the generator assigns
+        # _global_resource_ids after construction).
         resource_ids = self.get_resource_ids()
-        rid = self.paths[mode][task].resource_id
-        return resource_ids.index(rid) if rid in resource_ids else None
+        cached = getattr(self, "_resource_index", None)
+        if cached is None or cached[0] is not resource_ids:
+            cached = (resource_ids, {rid: idx for idx, rid in enumerate(resource_ids)})
+            self._resource_index = cached
+        return cached[1]
+
+    def get_resource(self, task: int, mode: int) -> Optional[int]:
+        return self.get_resource_index().get(self.paths[mode][task].resource_id)
 
 
 def main() -> None:
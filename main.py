@@ -151,6 +151,8 @@ def solve_model_for_instance(
 
     model.solve()
     runtime = time.time() - t0
+    if model.number_of_separated_constraints():
+        print(f"Separated {model.number_of_separated_constraints()} constraints during the solve")
 
     sol_file = f"{data_dir}/solution_{solver}_{scarcity:.1f}.json"
     model.write(sol_file)
@@ -195,6 +197,7 @@ def solve_model_for_instance(
         runtime=runtime,
         var_count=model.number_of_variables(),
         const_count=model.number_of_constraints(),
+        cut_count=model.number_of_separated_constraints(),
     )
 
 def cmd_generate(args: argparse.Namespace) -> None:
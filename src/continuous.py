@@ -1,9 +1,5 @@
 import gurobipy as gp
 from gurobipy import GRB
-import json
-from math import gcd
-import time
-from .utils import normalize
 from .model import GurobiModel
 from .vis_schedule import visualize_continuous_model
 
@@ -1,11 +1,15 @@
+import os
+
 from ortools.sat.python import cp_model
 import gurobipy as gp
 from gurobipy import GRB
+import numpy as np
+import scipy.sparse as sp
 
 if __name__ == "__main__":
-    from utils import normalize
+    from utils import normalize, serial_sgs
 else:
-    from .utils import normalize
+    from .utils import normalize, serial_sgs
 
 
 class Model:
@@ -115,10 +119,188 @@ class Model:
     def number_of_nonzeros(self):
         raise NotImplementedError
 
+    def number_of_separated_constraints(self):
+        """ Rows added during the solve by a separation callback, on top of number_of_constraints """
+        return 0
+
 
 class GurobiModel(Model):
+    # Cut callback passed to optimize(), or None. solve() is the only place that
+    # enables PreCrush and attaches it, so set it in initialize_model and go through
+    # solve() rather than calling optimize() on the Gurobi model directly.
+    callback = None
+
+    def __init__(self, *args, threads=None, concurrent_mip=1, params_file=None, **kwargs):
+        """
+        threads:        number of Gurobi threads (default: Gurobi's own setting)
+        concurrent_mip: number of concurrent MIP solves with diversified search profiles (default 1: off)
+        params_file:    tuned parameter file (.prm) written by tune(); when it exists, solve()
+                        loads it in place of the concurrent search profiles
+        See Model for the remaining arguments.
+        """
+        self.threads = threads
+        self.concurrent_mip = concurrent_mip
+        self.params_file = params_file
+        super().__init__(*args, **kwargs)
+
+    def has_tuned_params(self):
+        return self.params_file is not None and os.path.exists(self.params_file)
+
+    def configure_solver(self):
+        """
+        Apply the requested thread budget, then either the tuned parameters in
+        params_file or, with concurrent_mip > 1, concurrent solves that diversify the
+        search: one chases incumbents, the other the bound. With the defaults nothing
+        is changed, so solves stay comparable across formulations. Each concurrent
+        solve needs a thread of its own, so small thread budgets run a single solve.
+        """
+        if self.threads is not None:
+            self.model.setParam('Threads', self.threads)
+        if self.has_tuned_params():
+            self.model.read(self.params_file)
+            return
+        concurrent_mip = min(self.concurrent_mip, self.threads or os.cpu_count() or 1)
+        if concurrent_mip > 1:
+            self.model.setParam('ConcurrentMIP', concurrent_mip)
+            self.model.getConcurrentEnv(0).setParam('MIPFocus', 1)
+            self.model.getConcurrentEnv(1).setParam('MIPFocus', 3)
+            self.model.getConcurrentEnv(1).setParam('Heuristics', 0.5)
+
+    def resource_demand(self):
+        """
+        Per resource k, the (i, m, p[i][m], r[i][m][k]) tuples of every mode that
+        uses k, so resource rows skip the zero-demand terms.
+        """
+        return [
+            [(i, m, self.p[i][m], self.r[i][m][k]) for i in range(self.n) for m in range(self.M[i]) if self.r[i][m][k]]
+            for k in range(len(self.R))
+        ]
+
+    def add_resource_constraints(self, var, span, name="resource"):
+        """
+        Add the resource availability rows
+            sum_{i,m,tau} r[i][m][k] * var[i, m, tau] <= R[k]    for all t, k
+        where var[i, m, tau] occupies the time slots tau, ..., tau + span[i][m] - 1.
+        The rows are assembled as one sparse matrix and added with addMConstr.
+
+        var:  tupledict of variables keyed by (i, m, tau)
+        span: List of the number of time slots span[i][m] covered by a variable
+        """
+        K = len(self.R)
+        columns = list(var.values())
+        keys = np.array(list(var.keys()), dtype=np.int64).reshape(-1, 3)
+        i, m, tau = keys.T
+        spans = np.array([span[a][b] for a, b in zip(i.tolist(), m.tolist())], dtype=np.int64)
+        req = np.array([self.r[a][b] for a, b in zip(i.tolist(), m.tolist())], dtype=float).reshape(-1, K)
+        col = np.arange(len(columns))
+
+        rows, cols, vals = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)], [np.empty(0)]
+        for d in range(int(spans.max(initial=0))):
+            t = tau + d
+            covered = (spans > d) & (t < self.T)
+            for k in range(K):
+                nz = covered & (req[:, k] != 0)
+                rows.append(t[nz] * K + k)
+                cols.append(col[nz])
+                vals.append(req[nz, k])
+
+        A = sp.csr_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(self.T * K, len(columns)),
+        )
+        b = np.tile(np.asarray(self.R, dtype=float), self.T)
+        return self.model.addMConstr(A, columns, GRB.LESS_EQUAL, b, name=name)
+
+    def add_precedence_constraints(self, var, name="precedence"):
+        """
+        Add the aggregated precedence rows
+            sum_{m,t} (t + p[i][m]) * var[i, m, t] <= sum_{m,t} t * var[j, m, t]    for all (i,j) in E
+        where each side is one LinExpr over the columns of activity i. The
+        coefficients are read off the keys, so any key order or start window works.
+
+        var: tupledict of pulse variables keyed by (i, m, t)
+        """
+        columns = [[] for _ in range(self.n)]
+        starts = [[] for _ in range(self.n)]
+        ends = [[] for _ in range(self.n)]
+        for (i, m, t), v in var.items():
+            columns[i].append(v)
+            starts[i].append(t)
+            ends[i].append(t + self.p[i][m])
+        return self.model.addConstrs((
+            gp.LinExpr(ends[i], columns[i]) <= gp.LinExpr(starts[j], columns[j])
+            for i, j in self.E), name=name)
+
+    def constr_name(self, name):
+        """
+        Constraint name to pass to Gurobi, dropped in silent runs to skip building
+        per-row names. Variable names are kept: visualizers and .sol files use them.
+        """
+        return "" if self.silent else name
+
+    def makespan_objective(self, var, window):
+        """
+        Makespan expression sum_{m,t} t * var[n-1, m, t] of the sink activity,
+        built in one go from the variables in its start window.
+
+        var:    tupledict of pulse variables keyed by (i, m, t)
+        window: range of start times of the sink activity
+        """
+        last = self.n - 1
+        coeffs = [t for _ in range(self.M[last]) for t in window]
+        columns = [var[last, m, t] for m in range(self.M[last]) for t in window]
+        return gp.LinExpr(coeffs, columns)
+
+    def warm_start(self, var):
+        """
+        Seed Gurobi with the serial SGS schedule as a (partial) MIP start, by setting
+        Start = 1 on the pulse variable var[i, m, t] of each scheduled activity.
+
+        var: tupledict of pulse variables keyed by (i, m, t)
+        """
+        schedule = serial_sgs(self.n, self.T, self.R, self.E, self.p, self.r, self.ES)
+        if schedule is None:
+            return
+        for i, (m, t) in enumerate(schedule):
+            if (i, m, t) in var:
+                var[i, m, t].Start = 1
+
+    def set_lazy(self, constrs, level=2):
+        """
+        Mark constraints as lazy, so that Gurobi keeps them out of the initial LP
+        and pulls them in when violated (level 1-3, see the Lazy attribute).
+
+        constrs: tupledict of constraints as returned by addConstrs
+        """
+        constrs = list(constrs.values())
+        self.model.setAttr("Lazy", constrs, [level] * len(constrs))
+        return constrs
+
+    def tune(self, time_limit=600):
+        """
+        Run the Gurobi tuning tool on this model and write the best parameter set
+        to params_file. Tuning uses the same thread budget as solve() and no
+        concurrent profiles, which is also how solve() runs once the file exists.
+        time_limit: total tuning time in seconds (TuneTimeLimit)
+        """
+        if self.params_file is None:
+            raise ValueError("tune() needs a params_file to write the tuned parameters to")
+        if self.callback is not None:
+            raise ValueError("the tuning tool cannot run callbacks")
+        if self.threads is not None:
+            self.model.setParam('Threads', self.threads)
+        self.model.setParam('TuneTimeLimit', time_limit)
+        self.model.tune()
+        if self.model.tuneResultCount > 0:
+            self.model.getTuneResult(0)
+            self.model.write(self.params_file)
+
     def solve(self):
-        return self.model.optimize()
+        self.configure_solver()
+        if self.callback is None:
+            return self.model.optimize()
+        self.model.setParam('PreCrush', 1)
+        return self.model.optimize(self.callback)
 
     def update(self):
         return self.model.update()
@@ -164,6 +346,9 @@ class GurobiModel(Model):
     def number_of_nonzeros(self):
         return self.model.NumNZs
 
+    def number_of_separated_constraints(self):
+        return getattr(self.model, "_separated", 0)
+
 
 class CP_SATModel(Model):
     def solve(self):
@@ -1,9 +1,5 @@
 import gurobipy as gp
 from gurobipy import GRB
-import json
-from math import gcd
-import time
-from .utils import normalize
 from .model import GurobiModel
 from .vis_schedule import visualize_onoff_model
 
@@ -45,7 +41,7 @@ class OnoffModel(GurobiModel):
         #model.addConstrs((gp.quicksum(self.y[i, m, tau]/max(self.p[i][m], 1) for m in range(self.M) for tau in range(t) if self.p[i][m] > 0) >= gp.quicksum(self.y[j, m, t] for m in range(self.M)) for i,j in self.E for t in range(self.T)), name="precedence")
 
         # Resource availability
-        self.model.addConstrs((gp.quicksum(self.r[i][m][k] * self.y[i, m, t] for i in range(self.n) for m in range(self.M[i]) if self.p[i][m] > 0) <= self.R[k] for t in range(self.T) for k in range(len(self.R))), name="resource")
+        self.add_resource_constraints(self.y, [[min(p_im, 1) for p_im in p_i] for p_i in self.p], name="resource")
 
         # Linked modes of jobs (i,j)
         self.model.addConstrs((gp.quicksum(self.y[i, m, t] for t in range(self.T))/max(self.p[i][m],1) == gp.quicksum(self.y[j, m, t] for t in range(self.T))/max(self.p[j][m],1) for i,j in self.L for m in range(self.M[i])), name="linked")
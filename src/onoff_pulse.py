@@ -1,9 +1,5 @@
 import gurobipy as gp
 from gurobipy import GRB
-import json
-from math import gcd
-import time
-from .utils import normalize
 from .model import GurobiModel
 from .vis_schedule import visualize_pulse_model
 
@@ -17,47 +13,47 @@ class OnoffPulseModel(GurobiModel):
         self.model.setParam('TimeLimit', self.timeout)
 
         # Pulse variables
-        pulse_sets = [(i, m, t) for i in range(self.n) for m in range(self.M[i]) for t in range(self.T)]
+        x_t = {
+            i: range(self.ES[i], min(self.LS[i] + 1, self.T))
+            for i in range(self.n)
+        }
+        y_t = {
+            (i, m): range(self.ES[i], min(self.LS[i] + self.p[i][m] + 1, self.T))
+            for i in range(self.n) for m in range(self.M[i])
+        }
+        pulse_sets = [(i, m, t) for i in range(self.n) for m in range(self.M[i]) for t in x_t[i]]
+        onoff_sets = [(i, m, t) for i in range(self.n) for m in range(self.M[i]) for t in y_t[i, m]]
         self.x = self.model.addVars(pulse_sets, vtype=GRB.BINARY, name="pulse")
-        self.y = self.model.addVars(pulse_sets, vtype=GRB.BINARY, name="onoff")
+        self.warm_start(self.x)
+        self.y = self.model.addVars(onoff_sets, vtype=GRB.BINARY, name="onoff")
 
         # Objective
         if self.obj == "makespan":
-            self.model.setObjective(gp.quicksum(t * self.x[self.n-1, m, t] for t in range(self.T) for m in range(self.M[self.n-1])), GRB.MINIMIZE)
+            self.model.setObjective(self.makespan_objective(self.x, x_t[self.n-1]), GRB.MINIMIZE)
         elif self.obj == "flow-time":
-            self.model.setObjective(gp.quicksum(self.x[i, m, t] * (t + self.p[i][m] - self.ES[i]) for t in range(self.T) for i in range(self.n) for m in range(self.M[i])), GRB.MINIMIZE)
+            self.model.setObjective(gp.quicksum(self.x[i, m, t] * (t + self.p[i][m] - self.ES[i]) for i in range(self.n) for m in range(self.M[i]) for t in x_t[i]), GRB.MINIMIZE)
         elif self.obj == "process-flow-time":
-            self.model.setObjective(gp.quicksum(self.x[i, m, t] * (t + self.p[i][m] - self.ES[i]) for t in range(self.T) for i in self.O for m in range(self.M[i])), GRB.MINIMIZE)
+            self.model.setObjective(gp.quicksum(self.x[i, m, t] * (t + self.p[i][m] - self.ES[i]) for i in self.O for m in range(self.M[i]) for t in x_t[i]), GRB.MINIMIZE)
 
         # Constraints
         # Schedule job exactly once
         self.model.addConstrs((self.x.sum(i, "*", "*") == 1 for i in range(self.n)), name="schedule")
 
         # Connect pulse variables with onoff variables
-        self.model.addConstrs((self.y[i, m, t] == gp.quicksum(self.x[i, m, tau] for tau in range(max(t - self.p[i][m] + 1, 0), t+1)) for i in range(self.n) for t in range(self.T) for m in range(self.M[i])), name="connect_pulse_onoff")
-        self.model.addConstrs((gp.quicksum(self.y[i, m, t] for t in range(self.T)) == gp.quicksum(self.p[i][m] * self.x[i, m, t] for t in range(self.T)) for i in range(self.n) for m in range(self.M[i])), name="connect_pulse_onoff_processing_time")
+        self.model.addConstrs((self.y[i, m, t] == gp.quicksum(self.x[i, m, tau] for tau in range(max(t - self.p[i][m] + 1, x_t[i].start), min(t + 1, x_t[i].stop))) for i, m, t in onoff_sets), name="connect_pulse_onoff")
+        self.model.addConstrs((gp.quicksum(self.y[i, m, t] for t in y_t[i, m]) == gp.quicksum(self.p[i][m] * self.x[i, m, t] for t in x_t[i]) for i in range(self.n) for m in range(self.M[i])), name="connect_pulse_onoff_processing_time")
 
         # Precedence relations between jobs (i,j)
-        self.model.addConstrs((
-            gp.quicksum((t + self.p[i][m]) * self.x[i, m, t] for m in range(self.M[i]) for t in range(self.T)) <= 
-            gp.quicksum(t * self.x[j, m, t] for m in range(self.M[j]) for t in range(self.T))
-            for i,j in self.E), 
-            name="precedence")
+        self.add_precedence_constraints(self.x, name="precedence")
 
         # Resource availability
-        self.model.addConstrs((gp.quicksum(gp.quicksum(self.r[i][m][k] * self.x[i, m, tau] for tau in range(max(t-self.p[i][m]+1, 0), t+1)) for i in range(self.n) for m in range(self.M[i])) <= self.R[k] 
-                     for t in range(self.T) for k in range(len(self.R))), name="resource")
+        # y[i,m,t] already is the window sum of x, so each row only needs one term per (i,m)
+        self.add_resource_constraints(self.y, [[1] * self.M[i] for i in range(self.n)], name="resource")
 
         # Linked modes of jobs (i,j)
-        self.model.addConstrs((gp.quicksum(self.x[i, m, t] for t in range(self.T)) <= gp.quicksum(self.x[j, m, t] for t in range(self.T)) 
+        self.model.addConstrs((self.x.sum(i, m, "*") == self.x.sum(j, m, "*")
                               for i,j in self.L for m in range(self.M[i])), name="linked")
         
-        # Zero time slots 
-        self.model.addConstrs((self.x[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.ES[i])), name="zero_time_slots")
-        self.model.addConstrs((self.x[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.LS[i]+1, self.T)), name="zero_time_slots")
-        self.model.addConstrs((self.y[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.ES[i])), name="zero_time_slots_onoff")
-        self.model.addConstrs((self.y[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.LS[i]+self.p[i][m]+1, self.T)), name="zero_time_slots_onoff")
-        
         return self.model
 
     def visualize(self, filename: str) -> None:
@@ -73,47 +69,62 @@ class OnoffPulseModelDisaggregated(GurobiModel):
         self.model.setParam('TimeLimit', self.timeout)
         
         # Pulse variables
-        pulse_sets = [(i, m, t) for i in range(self.n) for m in range(self.M[i]) for t in range(self.T)]
+        x_t = {
+            i: range(self.ES[i], min(self.LS[i] + 1, self.T))
+            for i in range(self.n)
+        }
+        y_t = {
+            (i, m): range(self.ES[i], min(self.LS[i] + self.p[i][m] + 1, self.T))
+            for i in range(self.n) for m in range(self.M[i])
+        }
+        pulse_sets = [(i, m, t) for i in range(self.n) for m in range(self.M[i]) for t in x_t[i]]
+        onoff_sets = [(i, m, t) for i in range(self.n) for m in range(self.M[i]) for t in y_t[i, m]]
         self.x = self.model.addVars(pulse_sets, vtype=GRB.BINARY, name="pulse")
-        self.y = self.model.addVars(pulse_sets, vtype=GRB.BINARY, name="onoff")
+        self.warm_start(self.x)
+        self.y = self.model.addVars(onoff_sets, vtype=GRB.BINARY, name="onoff")
         
         # Objective
         if self.obj == "makespan":
-            self.model.setObjective(gp.quicksum(t * self.x[self.n-1, m, t] for t in range(self.T) for m in range(self.M[self.n-1])), GRB.MINIMIZE)
+            self.model.setObjective(self.makespan_objective(self.x, x_t[self.n-1]), GRB.MINIMIZE)
         elif self.obj == "flow-time":
-            self.model.setObjective(gp.quicksum(self.x[i, m, t] * (t + self.p[i][m] - self.ES[i]) for t in range(self.T) for i in range(self.n) for m in range(self.M[i])), GRB.MINIMIZE)
+            self.model.setObjective(gp.quicksum(self.x[i, m, t] * (t + self.p[i][m] - self.ES[i]) for i in range(self.n) for m in range(self.M[i]) for t in x_t[i]), GRB.MINIMIZE)
         elif self.obj == "process-flow-time":
-            self.model.setObjective(gp.quicksum(self.x[i, m, t] * (t + self.p[i][m] - self.ES[i]) for t in range(self.T) for i in self.O for m in range(self.M[i])), GRB.MINIMIZE)
+            self.model.setObjective(gp.quicksum(self.x[i, m, t] * (t + self.p[i][m] - self.ES[i]) for i in self.O for m in range(self.M[i]) for t in x_t[i]), GRB.MINIMIZE)
         
         # Constraints
         # Schedule job exactly once
         self.model.addConstrs((self.x.sum(i, "*", "*") == 1 for i in range(self.n)), name="schedule")
         
         # Connect pulse variables with onoff variables
-        self.model.addConstrs((self.y[i, m, t] == gp.quicksum(self.x[i, m, tau] for tau in range(max(t - self.p[i][m] + 1, 0), t+1)) for i in range(self.n) for t in range(self.T) for m in range(self.M[i])), name="connect_pulse_onoff")
-        self.model.addConstrs((gp.quicksum(self.y[i, m, t] for t in range(self.T)) == gp.quicksum(self.p[i][m] * self.x[i, m, t] for t in range(self.T)) for i in range(self.n) for m in range(self.M[i])), name="connect_pulse_onoff_processing_time")
+        self.model.addConstrs((self.y[i, m, t] == gp.quicksum(self.x[i, m, tau] for tau in range(max(t - self.p[i][m] + 1, x_t[i].start), min(t + 1, x_t[i].stop))) for i, m, t in onoff_sets), name="connect_pulse_onoff")
+        self.model.addConstrs((gp.quicksum(self.y[i, m, t] for t in y_t[i, m]) == gp.quicksum(self.p[i][m] * self.x[i, m, t] for t in x_t[i]) for i in range(self.n) for m in range(self.M[i])), name="connect_pulse_onoff_processing_time")
         
         # Precedence relations between jobs (i,j)
+        # Each side is a prefix of the time-ordered pulse variables of every mode,
+        # so rows are sliced from per-(i,m) lists instead of re-scanning tau.
+        pulse_vars = {(i, m): [self.x[i, m, t] for t in x_t[i]] for i in range(self.n) for m in range(self.M[i])}
+
+        def prefix(i, t, finished):
+            # Pulse variables of i that start (or, if finished, complete) at or before t
+            columns = []
+            for m in range(self.M[i]):
+                stop = t - self.p[i][m] + 1 if finished else t + 1
+                columns += pulse_vars[i, m][:max(stop - x_t[i].start, 0)]
+            return gp.LinExpr([1.0] * len(columns), columns)
+
         self.model.addConstrs((
-            gp.quicksum(self.x[i, m, tau] for m in range(self.M[i]) for tau in range(t-self.p[i][m]+1)) >=
-            gp.quicksum(self.x[j, m, tau] for m in range(self.M[j]) for tau in range(t+1))
+            prefix(i, t, finished=True) >= prefix(j, t, finished=False)
             for i,j in self.E for t in range(self.T)), 
             name="precedence")
         
         # Resource availability
-        self.model.addConstrs((gp.quicksum(gp.quicksum(self.r[i][m][k] * self.x[i, m, tau] for tau in range(max(t-self.p[i][m]+1, 0), t+1)) for i in range(self.n) for m in range(self.M[i])) <= self.R[k] 
-                     for t in range(self.T) for k in range(len(self.R))), name="resource")
+        # y[i,m,t] already is the window sum of x, so each row only needs one term per (i,m)
+        self.add_resource_constraints(self.y, [[1] * self.M[i] for i in range(self.n)], name="resource")
         
         # Linked modes of jobs (i,j)
-        self.model.addConstrs((gp.quicksum(self.x[i, m, t] for t in range(self.T)) <= gp.quicksum(self.x[j, m, t] for t in range(self.T)) 
+        self.model.addConstrs((self.x.sum(i, m, "*") == self.x.sum(j, m, "*")
                               for i,j in self.L for m in range(self.M[i])), name="linked")
         
-        # Zero time slots 
-        self.model.addConstrs((self.x[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.ES[i])), name="zero_time_slots")
-        self.model.addConstrs((self.x[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.LS[i]+1, self.T)), name="zero_time_slots")
-        self.model.addConstrs((self.y[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.ES[i])), name="zero_time_slots_onoff")
-        self.model.addConstrs((self.y[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.LS[i]+self.p[i][m]+1, self.T)), name="zero_time_slots_onoff")
-        
         return self.model
 
     def visualize(self, filename: str) -> None:
@@ -1,11 +1,8 @@
 import gurobipy as gp
 from gurobipy import GRB
-import json
-from math import gcd
-import time
-from .utils import normalize
 from .model import GurobiModel
 from .vis_schedule import visualize_pulse_model
+import numpy as np
 
 
 class PulseModel(GurobiModel):
@@ -23,10 +20,11 @@ class PulseModel(GurobiModel):
         }
         pulse_sets = [(i, m, t) for i in range(self.n) for m in range(self.M[i]) for t in x_t[i]]
         self.x = self.model.addVars(pulse_sets, vtype=GRB.BINARY, name="pulse")
+        self.warm_start(self.x)
 
         # Objective
         if self.obj == "makespan":
-            self.model.setObjective(gp.quicksum(t * self.x[self.n-1, m, t] for t in x_t[self.n-1] for m in range(self.M[self.n-1])), GRB.MINIMIZE)
+            self.model.setObjective(self.makespan_objective(self.x, x_t[self.n-1]), GRB.MINIMIZE)
         elif self.obj == "flow-time":
             self.model.setObjective(gp.quicksum(self.x[i, m, t] * (t + self.p[i][m] - self.ES[i]) for i in range(self.n) for m in range(self.M[i]) for t in x_t[i]), GRB.MINIMIZE)
         elif self.obj == "process-flow-time":
@@ -34,32 +32,21 @@ class PulseModel(GurobiModel):
 
         # Constraints
         # Schedule job exactly once
-        self.model.addConstrs((self.x.sum(i, "*", "*") == 1 for i in range(self.n)), name="schedule")
+        self.model.addConstrs((self.x.sum(i, "*", "*") == 1 for i in range(self.n)), name=self.constr_name("schedule"))
+        # The same choice as an SOS1 set, so Gurobi can branch on each activity's (m,t) group
+        for i in range(self.n):
+            self.model.addSOS(GRB.SOS_TYPE1, self.x.select(i, "*", "*"))
 
         # Precedence relations between jobs (i,j)
-        self.model.addConstrs((
-            gp.quicksum((t + self.p[i][m]) * self.x[i, m, t] for m in range(self.M[i]) for t in x_t[i]) <= 
-            gp.quicksum(t * self.x[j, m, t] for m in range(self.M[j]) for t in x_t[j])
-            for i,j in self.E), 
-            name="precedence")
+        precedence = self.add_precedence_constraints(self.x, name=self.constr_name("precedence"))
+        self.set_lazy(precedence)
 
         # Resource availability
-        self.model.addConstrs((
-            gp.quicksum(self.r[i][m][k] * self.x[i, m, tau] 
-                for i in range(self.n) 
-                for m in range(self.M[i]) 
-                for tau in range(
-                    max(t-self.p[i][m]+1, self.ES[i]), 
-                    min(t, self.LS[i])+1
-                )
-            ) <= self.R[k] 
-            for t in range(self.T) for 
-            k in range(len(self.R))
-        ), name="resource")
+        self.add_resource_constraints(self.x, self.p, name=self.constr_name("resource"))
 
         # Linked modes of jobs (i,j)
-        self.model.addConstrs((gp.quicksum(self.x[i, m, t] for t in x_t[i]) <= gp.quicksum(self.x[j, m, t] for t in x_t[j]) 
-                              for i,j in self.L for m in range(self.M[i])), name="linked")
+        self.model.addConstrs((self.x.sum(i, m, "*") == self.x.sum(j, m, "*")
+                              for i,j in self.L for m in range(self.M[i])), name=self.constr_name("linked"))
         
         # Zero time slots 
         #self.model.addConstrs((gp.quicksum(self.x[i, m, t] for t in x_t[i]) == 0 for i in range(self.n) for m in range(self.M[i])), name="zero_time_slots")
@@ -85,10 +72,11 @@ class PulseModelDisaggregated(PulseModel):
         }
         pulse_sets = [(i, m, t) for i in range(self.n) for m in range(self.M[i]) for t in x_t[i]]
         self.x = self.model.addVars(pulse_sets, vtype=GRB.BINARY, name="pulse")
+        self.warm_start(self.x)
 
         # Objective
         if self.obj == "makespan":
-            self.model.setObjective(gp.quicksum(t * self.x[self.n-1, m, t] for t in range(self.T) for m in range(self.M[self.n-1])), GRB.MINIMIZE)
+            self.model.setObjective(self.makespan_objective(self.x, x_t[self.n-1]), GRB.MINIMIZE)
         elif self.obj == "flow-time":
             self.model.setObjective(gp.quicksum(self.x[i, m, t] * (t + self.p[i][m] - self.ES[i]) for i in range(self.n) for m in range(self.M[i]) for t in x_t[i]), GRB.MINIMIZE)
         elif self.obj == "process-flow-time":
@@ -96,35 +84,38 @@ class PulseModelDisaggregated(PulseModel):
 
         # Constraints
         # Schedule job exactly once
-        self.model.addConstrs((self.x.sum(i, "*", "*") == 1 for i in range(self.n)), name="schedule")
+        self.model.addConstrs((self.x.sum(i, "*", "*") == 1 for i in range(self.n)), name=self.constr_name("schedule"))
+        # The same choice as an SOS1 set, so Gurobi can branch on each activity's (m,t) group
+        for i in range(self.n):
+            self.model.addSOS(GRB.SOS_TYPE1, self.x.select(i, "*", "*"))
 
         # Precedence relations between jobs (i,j)
-        self.model.addConstrs((
-            gp.quicksum(self.x[i, m, tau] for m in range(self.M[i]) for tau in range(
-                self.ES[i],
-                min(self.LS[i], t-self.p[i][m])+1
-            )) >=
-            gp.quicksum(self.x[j, m, tau] for m in range(self.M[j]) for tau in range(self.ES[j], min(self.LS[j], t)+1))
-            for i,j in self.E for t in range(self.T)), 
-            name="precedence_disaggregated")
+        # Only the aggregated rows are added up front. For binary x they already imply
+        # the disaggregated rows
+        #   sum_{m, tau <= t-p[i][m]} x[i,m,tau] >= sum_{m, tau <= t} x[j,m,tau]
+        # so those only tighten the relaxation and are separated as user cuts by
+        # disaggregated_precedence_callback; model._separated counts them.
+        self.add_precedence_constraints(self.x, name=self.constr_name("precedence"))
+        self.callback = disaggregated_precedence_callback
+        self.model._separated = 0
+        keys = list(self.x.keys())
+        self.model._x = list(self.x.values())
+        self.model._n = self.n
+        self.model._T = self.T
+        self.model._E = np.array(self.E, dtype=np.int64).reshape(-1, 2)
+        self.model._activity = np.array([i for i, _, _ in keys], dtype=np.int64)
+        self.model._start = np.array([t for _, _, t in keys], dtype=np.int64)
+        self.model._end = np.array([t + self.p[i][m] for i, m, t in keys], dtype=np.int64)
+        # The keys are grouped by activity, so each activity's columns form one contiguous block
+        bounds = np.searchsorted(self.model._activity, np.arange(self.n + 1))
+        self.model._columns = [np.arange(bounds[i], bounds[i + 1]) for i in range(self.n)]
 
         # Resource availability
-        self.model.addConstrs((
-            gp.quicksum(self.r[i][m][k] * self.x[i, m, tau] 
-                for i in range(self.n) 
-                for m in range(self.M[i]) 
-                for tau in range(
-                    max(t-self.p[i][m]+1, self.ES[i]), 
-                    min(t+1, self.LS[i]+1)
-                )
-            ) <= self.R[k] 
-            for t in range(self.T) for 
-            k in range(len(self.R))
-        ), name="resource")
+        self.add_resource_constraints(self.x, self.p, name=self.constr_name("resource"))
 
         # Linked modes of jobs (i,j)
-        self.model.addConstrs((gp.quicksum(self.x[i, m, t] for t in x_t[i]) <= gp.quicksum(self.x[j, m, t] for t in x_t[j]) 
-                              for i,j in self.L for m in range(self.M[i])), name="linked")
+        self.model.addConstrs((self.x.sum(i, m, "*") == self.x.sum(j, m, "*")
+                              for i,j in self.L for m in range(self.M[i])), name=self.constr_name("linked"))
         
         # Zero time slots 
         #self.model.addConstrs((self.x[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.ES[i], self.LS[i]+1)), name="zero_time_slots")
@@ -135,3 +126,33 @@ class PulseModelDisaggregated(PulseModel):
         visualize_pulse_model(self.model, self.n, self.T, self.M, self.R, self.p, self.r, self.processes, self.divisor, activity_names=None, filename=filename)
 
 
+def disaggregated_precedence_callback(model, where):
+    """
+    Separate the disaggregated precedence rows of PulseModelDisaggregated.
+    For every (i,j) in E and slot t, the fraction of i finished by t must be at
+    least the fraction of j started by t. Integer solutions satisfy these rows
+    through the aggregated ones, so only optimal node relaxations are checked
+    and violated rows are added with cbCut.
+    """
+    if where != GRB.Callback.MIPNODE or model.cbGet(GRB.Callback.MIPNODE_STATUS) != GRB.OPTIMAL:
+        return
+    values = np.array(model.cbGetNodeRel(model._x))
+
+    # started[i, t] / finished[i, t]: (fractional) number of starts / completions of i at or before t
+    n, T = model._n, model._T
+    started = np.zeros((n, T))
+    finished = np.zeros((n, T))
+    np.add.at(started, (model._activity, model._start), values)
+    done = model._end < T
+    np.add.at(finished, (model._activity[done], model._end[done]), values[done])
+    started = np.cumsum(started, axis=1)
+    finished = np.cumsum(finished, axis=1)
+
+    pred, succ = model._E.T
+    violation = started[succ] - finished[pred]
+    for e, t in zip(*np.nonzero(violation > 1e-6)):
+        i, j = pred[e], succ[e]
+        lhs = model._columns[i][model._end[model._columns[i]] <= t]
+        rhs = model._columns[j][model._start[model._columns[j]] <= t]
+        model.cbCut(gp.quicksum(model._x[c] for c in lhs) >= gp.quicksum(model._x[c] for c in rhs))
+        model._separated += 1
@@ -1,9 +1,5 @@
 import gurobipy as gp
 from gurobipy import GRB
-import json
-from math import gcd
-import time
-from .utils import normalize
 from .model import GurobiModel
 
 
@@ -34,28 +30,30 @@ class StepModel(GurobiModel):
 
         # Constraints
         # Schedule each job exactly once
-        self.model.addConstrs((gp.quicksum(self.z[i, m, self.LS[i]] for m in range(self.M[i])) == 1 for i in range(self.n)), name="schedule")
-        self.model.addConstrs((gp.quicksum(self.z[i, m, self.T-1] for m in range(self.M[i])) == 1 for i in range(self.n)), name="schedule")
+        self.model.addConstrs((gp.quicksum(self.z[i, m, self.LS[i]] for m in range(self.M[i])) == 1 for i in range(self.n)), name=self.constr_name("schedule"))
+        self.model.addConstrs((gp.quicksum(self.z[i, m, self.T-1] for m in range(self.M[i])) == 1 for i in range(self.n)), name=self.constr_name("schedule"))
 
         # If job is started, at or before $t-1$ in mode $m$, it has also started before $t$ in mode $m$
-        self.model.addConstrs((self.z[i, m, t-1] <= self.z[i, m, t] for i in range(self.n) for m in range(self.M[i]) for t in range(1, self.T)), name="started_same_mode")
+        self.model.addConstrs((self.z[i, m, t-1] <= self.z[i, m, t] for i in range(self.n) for m in range(self.M[i]) for t in range(1, self.T)), name=self.constr_name("started_same_mode"))
 
         # Precedence relations between jobs (i,j)
-        self.model.addConstrs((
-            gp.quicksum((t + self.p[i][m]) * (self.z[i, m, t] - (self.z[i, m, t-1] if t-1>=0 else 0)) for t in range(self.T) for m in range(self.M[i])) <= 
-            gp.quicksum(t * (self.z[j, m, t] - (self.z[j, m, t-1] if t-1>=0 else 0)) for t in range(self.T) for m in range(self.M[j]))
+        precedence = self.model.addConstrs((
+            gp.quicksum((t + self.p[i][m]) * (self.z[i, m, t] - (self.z[i, m, t-1] if t > 0 else 0)) for m in range(self.M[i]) for t in range(self.T)) <= 
+            gp.quicksum(t * (self.z[j, m, t] - (self.z[j, m, t-1] if t > 0 else 0)) for m in range(self.M[j]) for t in range(self.T))
             for i,j in self.E), 
-            name="precedence")
+            name=self.constr_name("precedence"))
+        self.set_lazy(precedence)
 
         # Resource availability
-        self.model.addConstrs((gp.quicksum(self.r[i][m][k] * (self.z[i, m, t] - (self.z[i, m, max(t - self.p[i][m], 0)] if t-self.p[i][m]>=0 else 0)) for i in range(self.n) for m in range(self.M[i])) <= self.R[k] 
-                     for t in range(self.T) for k in range(len(self.R))), name="resource")
+        demand = self.resource_demand()
+        self.model.addConstrs((gp.quicksum(r_imk * (self.z[i, m, t] - (self.z[i, m, t - p_im] if t >= p_im else 0)) for i, m, p_im, r_imk in demand[k]) <= self.R[k] 
+                     for t in range(self.T) for k in range(len(self.R))), name=self.constr_name("resource"))
 
         # Linked modes of jobs (i,j)
-        self.model.addConstrs((self.z[i, m, self.T-1] == self.z[j, m, self.T-1] for i,j in self.L for m in range(self.M[i])), name="linked")
+        self.model.addConstrs((self.z[i, m, self.T-1] == self.z[j, m, self.T-1] for i,j in self.L for m in range(self.M[i])), name=self.constr_name("linked"))
         
         # Earliest start times
-        self.model.addConstrs((self.z[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.ES[i])), name="earliest_start_times")
+        self.model.addConstrs((self.z[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.ES[i])), name=self.constr_name("earliest_start_times"))
         
         return self.model
 
@@ -90,27 +88,29 @@ class StepModelDisaggregated(GurobiModel):
 
         # Constraints
         # Schedule each job exactly once
-        self.model.addConstrs((gp.quicksum(self.z[i, m, self.LS[i]] for m in range(self.M[i])) == 1 for i in range(self.n)), name="schedule")
-        self.model.addConstrs((gp.quicksum(self.z[i, m, self.T-1] for m in range(self.M[i])) == 1 for i in range(self.n)), name="schedule")
+        self.model.addConstrs((gp.quicksum(self.z[i, m, self.LS[i]] for m in range(self.M[i])) == 1 for i in range(self.n)), name=self.constr_name("schedule"))
+        self.model.addConstrs((gp.quicksum(self.z[i, m, self.T-1] for m in range(self.M[i])) == 1 for i in range(self.n)), name=self.constr_name("schedule"))
 
         # If job is started, at or before $t-1$ in mode $m$, it has also started before $t$ in mode $m$
-        self.model.addConstrs((self.z[i, m, t-1] <= self.z[i, m, t] for i in range(self.n) for m in range(self.M[i]) for t in range(1, self.T)), name="started_same_mode")
+        self.model.addConstrs((self.z[i, m, t-1] <= self.z[i, m, t] for i in range(self.n) for m in range(self.M[i]) for t in range(1, self.T)), name=self.constr_name("started_same_mode"))
 
         # Precedence relations between jobs (i,j)
-        self.model.addConstrs((
-            gp.quicksum(self.z[i, m, max(t - self.p[i][m], 0)] if t-self.p[i][m]>=0 else 0 for m in range(self.M[i])) >= 
+        precedence = self.model.addConstrs((
+            gp.quicksum(self.z[i, m, t - self.p[i][m]] for m in range(self.M[i]) if t >= self.p[i][m]) >= 
             gp.quicksum(self.z[j, m, t] for m in range(self.M[j])) for i,j in self.E for t in range(self.T)), 
-            name="precedence_disaggregated")
+            name=self.constr_name("precedence_disaggregated"))
+        self.set_lazy(precedence)
 
         # Resource availability
-        self.model.addConstrs((gp.quicksum(self.r[i][m][k] * (self.z[i, m, t] - (self.z[i, m, max(t - self.p[i][m], 0)] if t-self.p[i][m]>=0 else 0)) for i in range(self.n) for m in range(self.M[i])) <= self.R[k] 
-                     for t in range(self.T) for k in range(len(self.R))), name="resource")
+        demand = self.resource_demand()
+        self.model.addConstrs((gp.quicksum(r_imk * (self.z[i, m, t] - (self.z[i, m, t - p_im] if t >= p_im else 0)) for i, m, p_im, r_imk in demand[k]) <= self.R[k] 
+                     for t in range(self.T) for k in range(len(self.R))), name=self.constr_name("resource"))
 
         # Linked modes of jobs (i,j)
-        self.model.addConstrs((self.z[i, m, self.T-1] == self.z[j, m, self.T-1] for i,j in self.L for m in range(self.M[i])), name="linked")
+        self.model.addConstrs((self.z[i, m, self.T-1] == self.z[j, m, self.T-1] for i,j in self.L for m in range(self.M[i])), name=self.constr_name("linked"))
         
         # Earliest start times
-        self.model.addConstrs((self.z[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.ES[i])), name="earliest_start_times")
+        self.model.addConstrs((self.z[i, m, t] == 0 for i in range(self.n) for m in range(self.M[i]) for t in range(self.ES[i])), name=self.constr_name("earliest_start_times"))
         
         return self.model
 
@@ -1,73 +1,118 @@
-import gurobipy as gp
 from gurobipy import GRB
+import argparse
 import json
-import time
-from continuous import continuous_model
-from onoff import onoff_model
-from step import step_model, step_model_disaggregated
-from pulse import pulse_model, pulse_model_disaggregated
-from onoff_pulse import onoff_pulse_model, onoff_pulse_model_disaggregated
-import copy
+import sys
+from .continuous import ContinuousModel
+from .onoff import OnoffModel
+from .step import StepModel, StepModelDisaggregated
+from .pulse import PulseModel, PulseModelDisaggregated
+from .onoff_pulse import OnoffPulseModel, OnoffPulseModelDisaggregated
+from .utils import get_earliest_start_time, get_latest_start_time, get_unrelated_pairs, normalize
 
 
-def test_models(models, input_base, silent=True, time_limit=7200):
+def load_instance(filename):
+    """
+    Read a test instance (tests/*.json) into Model arguments.
+    The files give a single mode count M and no O, ES, LS: O are the predecessors of the
+    sink, and ES/LS are computed on the normalized processing times, so the models see
+    divisor 1. Returns (instance, divisor).
+    """
+    data = json.load(open(filename))
+    n = data["n"]
+    M = data["M"] if isinstance(data["M"], list) else [data["M"]] * n
+    p, T, divisor = normalize(data["p"], data["T"])
+    E, L, R, r = data["E"], data["L"], data["R"], data["r"]
+    VP = get_unrelated_pairs(n, E)
+    instance = dict(n=n, T=T, M=M, R=R, E=E, p=p, L=L, r=r, VP=VP,
+                    O=[i for i, j in E if j == n - 1],
+                    ES=get_earliest_start_time(n, T, M, R, E, p, L, r, VP),
+                    LS=get_latest_start_time(n, T, M, R, E, p, L, r, VP))
+    return instance, divisor
+
+
+def test_models(models, instance, divisor=1, silent=True, time_limit=7200, threads=None, concurrent_mip=2, tune=False, tune_time_limit=600):
     results = []
-    for model_name, model_init in models:
+    for model_name, model_cls in models:
         print(f'Testing model `{model_name}`')
-        input = copy.deepcopy(input_base)
-        VP = [[i,j] for i in range(input["n"]) for j in range(input["n"]) if [i,j] not in input["E"] and [j,i] not in input["E"] and i != j]
-        model, divisor = model_init(n=input["n"], T=input["T"], M=input["M"], R=input["R"], E=input["E"], VP=VP, p=input["p"], L=input["L"], r=input["r"])
-        model.setParam('TimeLimit', time_limit)
-        model.optimize()
+        # Tuned parameters are kept per model, as each formulation tunes differently
+        model = model_cls(**instance, silent=silent, timeout=time_limit, threads=threads,
+                          concurrent_mip=concurrent_mip, params_file=f"tuned_{model_name}.prm")
+        # The tuning tool cannot run callbacks, so models that separate rows in one are solved untuned
+        if tune and model.callback is not None:
+            print(f"Skipping tuning of `{model_name}`: it separates constraints in a callback")
+        elif tune:
+            model.tune(tune_time_limit)
+        model.solve()
+        objective = model.get_objective()
         results.append({
             "model_name": model_name,
-            "status": model.status,
-            "objective": model.objVal * divisor if model.status != GRB.INFEASIBLE else -1,
-            "gap": model.MIPGap,
-            "runtime": model.Runtime,
-            "variables": model.NumVars,
-            "constraints": model.NumConstrs
+            "status": model.status(),
+            "objective": objective * divisor if objective is not None else -1,
+            "gap": model.model.MIPGap if model.is_feasible() else float("inf"),
+            "runtime": model.solver_time(),
+            "variables": model.number_of_variables(),
+            "constraints": model.number_of_constraints()
         })
         if not silent: 
-            if model.status == GRB.INFEASIBLE:
+            if not model.is_feasible():
                 print(f"\033[91mModel `{model_name}` infeasible\033[0m")
             else: 
                 print(f"\033[92mModel `{model_name}` feasible\033[0m")
-                print(f"Running time `{model_name}`: {model.Runtime} s")
+                print(f"Running time `{model_name}`: {model.solver_time()} s")
     return results
 
-def latex_table(stat):
+def latex_table(stats):
     # Create latex table
-    print(r"\begin{table}[!ht]")
-    print(r"\centering")
-    print(r"\begin{tabular}{l r r r r r}")
-    print(r"\hline")
-    print(r"Model & Objective & Gap & Runtime (s) & \#Vars & \#Cons \\")
-    print(r"\hline")
-
-    for stat in stats:
-        print(f"{stat['model_name']} & "
-              f"{stat['objective']:.3f} & {stat['gap']:.3f} & "
-              f"{stat['runtime']:.3f} & {stat['variables']} & {stat['constraints']} \\\\")
-
-    print(r"\hline")
-    print(r"\end{tabular}")
-    print(r"\caption{Solver statistics for different models (without status)}")
-    print(r"\end{table}")
+    rows = [
+        r"\begin{table}[!ht]",
+        r"\centering",
+        r"\begin{tabular}{l r r r r r}",
+        r"\hline",
+        r"Model & Objective & Gap & Runtime (s) & \#Vars & \#Cons \\",
+        r"\hline",
+    ]
+    rows += [
+        f"{stat['model_name']} & "
+        f"{stat['objective']:.3f} & {stat['gap']:.3f} & "
+        f"{stat['runtime']:.3f} & {stat['variables']} & {stat['constraints']} \\\\"
+        for stat in stats
+    ]
+    rows += [
+        r"\hline",
+        r"\end{tabular}",
+        r"\caption{Solver statistics for different models (without status)}",
+        r"\end{table}",
+    ]
+    sys.stdout.write("\n".join(rows) + "\n")
 
 if __name__ == "__main__":
-    # input_base = json.load(open("tests/simple.json"))
-    input_base = json.load(open("tests/ra-pst-2.json"))
-    stats = test_models([
-        ("PDT", pulse_model),
-        ("PDDT", pulse_model_disaggregated),
-        ("SDT", step_model),
-        ("SDDT", step_model_disaggregated),
-        ("OODDT", onoff_model),
-        ("OOPDT", onoff_pulse_model),
-        ("OOPDDT", onoff_pulse_model_disaggregated),
-        ("MSEQCT", continuous_model)
-    ], input_base=input_base, silent=True, time_limit=300)
+    # Run from the repository root: python -m src.test [--tune]
+    parser = argparse.ArgumentParser(description="Compare the MRCPSP models on a test instance.")
+    parser.add_argument("--instance", default="tests/ra-pst-2.json", help="test instance (JSON)")
+    parser.add_argument("--time-limit", type=float, default=300, help="time limit per model in seconds")
+    parser.add_argument("--threads", type=int, default=None, help="Gurobi threads (default: Gurobi's own setting)")
+    parser.add_argument("--concurrent-mip", type=int, default=2, help="concurrent MIP solves (1 disables)")
+    parser.add_argument("--tune", action="store_true", help="run the Gurobi tuning tool and write tuned_<model>.prm")
+    parser.add_argument("--tune-time-limit", type=float, default=600, help="tuning time limit in seconds")
+    parser.add_argument("--models", nargs="+", default=None, help="subset of models to run (default: all)")
+    args = parser.parse_args()
+
+    models = [
+        ("PDT", PulseModel),
+        ("PDDT", PulseModelDisaggregated),
+        ("SDT", StepModel),
+        ("SDDT", StepModelDisaggregated),
+        ("OODDT", OnoffModel),
+        ("OOPDT", OnoffPulseModel),
+        ("OOPDDT", OnoffPulseModelDisaggregated),
+        ("MSEQCT", ContinuousModel)
+    ]
+    if args.models is not None:
+        models = [(name, cls) for name, cls in models if name in args.models]
+    instance, divisor = load_instance(args.instance)
+    stats = test_models(models, instance, divisor=divisor, silent=True, time_limit=args.time_limit,
+                        threads=args.threads, concurrent_mip=args.concurrent_mip,
+                        tune=args.tune, tune_time_limit=args.tune_time_limit)
     # create table
     print(f"| {'model_name':<10} | {'status':<10} | {'objective':<10} | {'gap':<10} | {'runtime':<10} | {'# Vars':<10} | {'# Cons':<10} |")
     print(f"| {'-'*10} | {'-'*10} | {'-'*10} | {'-'*10} | {'-'*10} | {'-'*10} | {'-'*10} |")
@@ -1,5 +1,31 @@
+from collections import deque
 from math import gcd
-from collections import defaultdict
+
+import numpy as np
+
+
+def topological_order(n, E):
+    """
+    Kahn's algorithm on the precedence DAG.
+    :param n: number of activities
+    :param E: List of pairs of activity indices (i,j) indicating precedence relations
+    :return: (topological order of the activities, successor index array of each activity)
+    """
+    succs: list[list[int]] = [[] for _ in range(n)]
+    indegree = [0] * n
+    for i, j in E:
+        succs[i].append(j)
+        indegree[j] += 1
+    queue = deque(i for i in range(n) if indegree[i] == 0)
+    order = []
+    while queue:
+        i = queue.popleft()
+        order.append(i)
+        for j in succs[i]:
+            indegree[j] -= 1
+            if indegree[j] == 0:
+                queue.append(j)
+    return order, [np.array(succ, dtype=np.int64) for succ in succs]
 
 
 def get_earliest_start_time(n, T, M, R, E, p, L, r, VP, ES=None):
@@ -18,17 +44,18 @@ def get_earliest_start_time(n, T, M, R, E, p, L, r, VP, ES=None):
     :param ES: Earliest start time for each activity i
     :return: List of earliest start times for each activity i
     """
-    preds: dict[int, list[tuple[int, int]]] = defaultdict(list)
-    for i, j in E:
-        preds[j].append((i, min(p[i][m] for m in range(M[i]))))
-    earliest_starting_times = [0] * n
+    order, succs = topological_order(n, E)
+    p_min = np.array([min(p[i][m] for m in range(M[i])) for i in range(n)], dtype=np.int64)
+    earliest_starting_times = np.zeros(n, dtype=np.int64)
     if ES is not None:
-        for i in range(n):
-            earliest_starting_times[i] = max(earliest_starting_times[i], ES[i])
-    for i in range(n):
-        for pred, min_p in preds[i]:
-            earliest_starting_times[i] = max(earliest_starting_times[i], earliest_starting_times[pred] + min_p)
-    return earliest_starting_times
+        np.maximum(earliest_starting_times, ES, out=earliest_starting_times)
+    for i in order:
+        succ = succs[i]
+        if len(succ):
+            earliest_starting_times[succ] = np.maximum(
+                earliest_starting_times[succ], earliest_starting_times[i] + p_min[i]
+            )
+    return earliest_starting_times.tolist()
 
 
 def get_latest_start_time(n, T, M, R, E, p, L, r, VP):
@@ -46,18 +73,73 @@ def get_latest_start_time(n, T, M, R, E, p, L, r, VP):
     :param VP: List of pairs of activity indices (i,j) that are not precedence-related
     :return: List of latest start times for each activity i
     """
-    succs: dict[int, list[tuple[int, int]]] = defaultdict(list)
-    for i, j in E:
-        succs[i].append((j, min(p[j][m] for m in range(M[j]))))
-    latest_starting_times = [T-1] * n
-    for i in range(n-1, -1, -1):
-        for succ, max_p in succs[i]:
-            if latest_starting_times[succ] >= 0:
-                latest_starting_times[i] = min(latest_starting_times[i], latest_starting_times[succ] - max_p)
-    return latest_starting_times
+    order, succs = topological_order(n, E)
+    p_min = np.array([min(p[j][m] for m in range(M[j])) for j in range(n)], dtype=np.int64)
+    latest_starting_times = np.full(n, T-1, dtype=np.int64)
+    for i in reversed(order):
+        succ = succs[i]
+        succ = succ[latest_starting_times[succ] >= 0]
+        if len(succ):
+            latest_starting_times[i] = min(
+                latest_starting_times[i], (latest_starting_times[succ] - p_min[succ]).min()
+            )
+    return latest_starting_times.tolist()
+
+
+def serial_sgs(n, T, R, E, p, r, ES=None):
+    """
+    Serial schedule generation scheme: activities are scheduled in topological order,
+    each in mode 0 (which also respects linked modes) at the earliest start that satisfies
+    its precedence relations and the resource capacities.
+    :param n: number of activities
+    :param T: number of time slots 1,...,T
+    :param R: List of resource capacities R[k]
+    :param E: List of pairs of activity indices (i,j) indicating precedence relations
+    :param p: List of processing times for each activity i in each mode m p[i][m]
+    :param r: List of resource requirements for each activity i in each mode m on resource k r[i][m][k]
+    :param ES: Earliest start time for each activity i
+    :return: List of (mode, start time) for each activity i, or None if the schedule exceeds T
+    """
+    order, succs = topological_order(n, E)
+    capacity = np.asarray(R, dtype=np.int64)
+    usage = np.zeros((T, len(R)), dtype=np.int64)
+    release = list(ES) if ES is not None else [0] * n
+    schedule = [None] * n
+    for i in order:
+        duration = p[i][0]
+        demand = np.asarray(r[i][0], dtype=np.int64)
+        t = release[i]
+        while t + max(duration, 1) <= T and np.any(usage[t:t + duration] + demand > capacity):
+            t += 1
+        if t + max(duration, 1) > T:
+            return None
+        usage[t:t + duration] += demand
+        schedule[i] = (0, t)
+        for j in succs[i].tolist():
+            release[j] = max(release[j], t + duration)
+    return schedule
+
+
+def get_unrelated_pairs(n, E):
+    """
+    Ordered pairs of distinct activities that are not related by the given precedence relations.
+    :param n: number of activities
+    :param E: List of pairs of activity indices (i,j) indicating precedence relations
+    :return: List of pairs of activity indices (i,j) with neither (i,j) nor (j,i) in E
+    """
+    related = {(i, j) for i, j in E}
+    related |= {(j, i) for i, j in related}
+    return [[i, j] for i in range(n) for j in range(n) if i != j and (i, j) not in related]
 
 
 def normalize(p: list[list[int]], T: int) -> tuple[list[list[int]], int, int]:
     """ Normalize the processing times. returns (noramlized p, normalized T, divisor) """
-    d = gcd(*{v for job in p for v in job}, T)
+    # Fold gcd over the flattened (ragged) times, stopping as soon as it reaches 1
+    d = T
+    for v in (v for job in p for v in job):
+        d = gcd(d, v)
+        if d == 1:
+            break
+    if d == 1:
+        return [list(job) for job in p], T, 1
     return [[v // d for v in job] for job in p], T // d, d